@@ -32,12 +32,12 @@ with preamble_col2:
 def calculate_priority(df):
     """Calculates priority score based on Urgency, Impact, and Effort."""
     # Formula: (Urgency + Impact + (10 - Effort)) / 3
-    # We use fillna(0) to ensure the math works even if fields are empty
-    return (
-        df["Urgency (0-10)"].fillna(0) + 
-        df["Impact (0-10)"].fillna(0) + 
-        (10 - df["Effort (0-10)"].fillna(0))
-    ) / 3
+    # Computed on the raw numpy arrays (na_value=0 keeps the math working even
+    # if fields are empty) instead of chaining fillna Series allocations
+    u = df["Urgency (0-10)"].to_numpy(dtype=np.float32, na_value=0, copy=False)
+    i = df["Impact (0-10)"].to_numpy(dtype=np.float32, na_value=0, copy=False)
+    e = df["Effort (0-10)"].to_numpy(dtype=np.float32, na_value=0, copy=False)
+    return (u + i + (10.0 - e)) * (1.0 / 3.0)
 
 # --- Data Initialization ---
 if "tasks_df" not in st.session_state:
@@ -59,6 +59,9 @@ if "id" not in st.session_state.tasks_df.columns:
 # Initialize selection state if not present
 if "selected_indices" not in st.session_state:
     st.session_state.selected_indices = []
+if "_sel_fs" not in st.session_state:
+    # Frozenset mirror of selected_indices, kept in sync for O(1) change checks
+    st.session_state._sel_fs = frozenset()
 if "last_selection_source" not in st.session_state:
     st.session_state.last_selection_source = None
 
@@ -77,9 +80,11 @@ with st.sidebar:
     """)
     
     if st.button("Clear Selection"):
-        st.session_state.selected_indices = []
-        st.session_state.last_selection_source = None
-        st.rerun()
+        if st.session_state.selected_indices:
+            st.session_state.selected_indices = []
+            st.session_state._sel_fs = frozenset()
+            st.session_state.last_selection_source = None
+            st.rerun()
 
 # --- Section 1: Editable Dataframe ---
 st.subheader("Task List")
@@ -103,33 +108,49 @@ column_config = {
     "id": None # Hide ID column
 }
 
-# Capture the edited dataframe from the UI
-edited_df = st.data_editor(
-    st.session_state.tasks_df,
-    column_config=column_config,
-    num_rows="dynamic",
-    width="stretch",
-    key="editor",
-    hide_index=True,
-    disabled=["Priority"]
-)
+@st.fragment
+def render_task_editor():
+    """Editable task table plus the save button, isolated in a fragment so
+    editor interactions do not re-execute the chart-heavy analysis below."""
+    # Capture the edited dataframe from the UI
+    edited_df = st.data_editor(
+        st.session_state.tasks_df,
+        column_config=column_config,
+        num_rows="dynamic",
+        width="stretch",
+        key="editor",
+        hide_index=True,
+        disabled=["Priority"]
+    )
 
-# Button to trigger the update
-if st.button("Save / Update Analysis", type="primary"):
-    # 1. Update the session state with the new data from the editor
-    st.session_state.tasks_df = edited_df.copy()
-    
-    # 2. Reset index to ensure clean sequential IDs (handles deletions cleanly)
-    st.session_state.tasks_df.reset_index(drop=True, inplace=True)
-    
-    # 3. Ensure every row has a unique ID (crucial for new rows added via UI)
-    st.session_state.tasks_df["id"] = st.session_state.tasks_df.index
-    
-    # 4. Recalculate Priority for the whole dataframe
-    st.session_state.tasks_df["Priority"] = calculate_priority(st.session_state.tasks_df)
-    
-    # 5. Rerun the app to update charts with the new data
-    st.rerun()
+    # Button to trigger the update
+    if st.button("Save / Update Analysis", type="primary"):
+        score_cols = ["Urgency (0-10)", "Impact (0-10)", "Effort (0-10)"]
+        prev_df = st.session_state.tasks_df
+
+        # 1. Update the session state with the new data from the editor
+        # (data_editor already returns a new frame, so no defensive copy needed)
+        st.session_state.tasks_df = edited_df
+
+        # 2. Reset index to ensure clean sequential IDs (handles deletions cleanly)
+        st.session_state.tasks_df.reset_index(drop=True, inplace=True)
+
+        # 3. Ensure every row has a unique ID (crucial for new rows added via UI)
+        st.session_state.tasks_df["id"] = st.session_state.tasks_df.index
+
+        # 4. Recalculate Priority only where a score actually changed; row
+        # adds/deletes change the length and fall back to a full recompute
+        if len(edited_df) == len(prev_df):
+            changed = (edited_df[score_cols].to_numpy() != prev_df[score_cols].to_numpy()).any(axis=1)
+            if changed.any():
+                st.session_state.tasks_df.loc[changed, "Priority"] = calculate_priority(edited_df.loc[changed])
+        else:
+            st.session_state.tasks_df["Priority"] = calculate_priority(st.session_state.tasks_df)
+
+        # 5. Rerun the app to update charts with the new data
+        st.rerun()
+
+render_task_editor()
 
 # --- Helper: Handle Selection ---
 def update_selection(selection_state, source_name):
@@ -147,315 +168,417 @@ def update_selection(selection_state, source_name):
 # Note: The charts below use 'st.session_state.tasks_df'.
 # This means they show the state as of the LAST "Save/Update" click, not the current un-saved edits.
 
-st.divider()
-st.subheader("3D Priority Space")
+# Helper to convert hex to rgba for transparency handling
+def hex_to_rgba(hex_code, alpha):
+    hex_code = hex_code.lstrip('#')
+    return f"rgba({int(hex_code[0:2], 16)}, {int(hex_code[2:4], 16)}, {int(hex_code[4:6], 16)}, {alpha})"
+
+# Pre-rendered RGBA strings for the marker palette, built once at import so no
+# hex parsing happens at render time
+PENDING_RGBA = hex_to_rgba('#e74c3c', 1.0)
+COMPLETED_RGBA = hex_to_rgba('#2ecc71', 0.3)     # completed markers, 3D chart
+COMPLETED_2D_RGBA = hex_to_rgba('#2ecc71', 0.5)  # completed markers, 2D charts
+DIM_RGBA = "rgba(200, 200, 200, 0.1)"            # unselected markers
+
+# Define colors based on selection state (using RGBA for transparency).
+# Vectorized: one np.where over the selection mask instead of a per-row loop.
+def get_marker_colors(sel_mask, selected, base_rgba):
+    # If nothing is selected — or every plotted point is — a scalar color is
+    # enough (Plotly broadcasts it), skipping the per-point array entirely
+    if not selected or sel_mask.all():
+        return base_rgba
+    # Selected rows keep the base color/alpha (highlighted); the rest dim to grey
+    return np.where(sel_mask, base_rgba, DIM_RGBA).tolist()
+
+def df_to_rows(df):
+    """Hashable snapshot of the plot data, used as the cache key for the figure
+    builders. Zips the raw numpy arrays rather than the Series, which avoids
+    per-element boxing during iteration."""
+    return tuple(zip(
+        df.index.to_numpy(),
+        df["Task"].to_numpy(),
+        df["Urgency (0-10)"].to_numpy(),
+        df["Impact (0-10)"].to_numpy(),
+        df["Effort (0-10)"].to_numpy(),
+        df["Status"].to_numpy(),
+    ))
+
+def rows_to_arrays(rows):
+    """Rebuild the active/completed split from a row snapshot as plain numpy
+    column arrays (one dict per status). Plotly accepts numpy arrays directly,
+    so this skips pandas Series boxing."""
+    idx, task, u, i, e, status = (np.asarray(col) for col in zip(*rows))
+    active_mask = status == False
+    completed_mask = status == True
+
+    def _columns(mask):
+        return {'task': task[mask], 'u': u[mask], 'i': i[mask], 'e': e[mask], 'idx': idx[mask]}
+
+    return _columns(active_mask), _columns(completed_mask)
+
+# Quadrant divider planes for the 3D scene, one flat two-triangle Mesh3d per
+# plane — far cheaper for the client than a tessellated, shaded Surface. They
+# never change, so construct (and validate) them once at import rather than on
+# every figure build
+_DIVIDER_TRACES = (
+    # Plane at X=5 (Urgency midpoint)
+    go.Mesh3d(
+        x=[5, 5, 5, 5], y=[0, 10, 10, 0], z=[0, 0, 10, 10],
+        i=[0, 0], j=[1, 2], k=[2, 3],
+        opacity=0.1, color='gray', hoverinfo='skip', flatshading=True
+    ),
+    # Plane at Y=5 (Impact midpoint)
+    go.Mesh3d(
+        x=[0, 10, 10, 0], y=[5, 5, 5, 5], z=[0, 0, 10, 10],
+        i=[0, 0], j=[1, 2], k=[2, 3],
+        opacity=0.1, color='gray', hoverinfo='skip', flatshading=True
+    ),
+    # Plane at Z=5 (Effort midpoint)
+    go.Mesh3d(
+        x=[0, 10, 10, 0], y=[0, 0, 10, 10], z=[5, 5, 5, 5],
+        i=[0, 0], j=[1, 2], k=[2, 3],
+        opacity=0.1, color='gray', hoverinfo='skip', flatshading=True
+    ),
+)
+
+# Static layout for the 3D scene (requested background colors included).
+# Defined once at module scope so the builder only assembles trace data
+layout_3d = dict(
+    margin=dict(l=0, r=0, b=0, t=0),
+    scene=dict(
+        xaxis=dict(
+            title='Urgency',
+            range=[0, 10],
+            backgroundcolor="rgb(200, 200, 230)",
+            gridcolor="white",
+            showbackground=True,
+            zerolinecolor="white"
+        ),
+        yaxis=dict(
+            title='Impact',
+            range=[0, 10],
+            backgroundcolor="rgb(230, 200, 230)",
+            gridcolor="white",
+            showbackground=True,
+            zerolinecolor="white"
+        ),
+        zaxis=dict(
+            title='Effort',
+            # We flip the Z axis (10 to 0) so Low Effort (0) appears at the "Top".
+            # This aligns visually with High Urgency/Impact.
+            range=[10, 0],
+            backgroundcolor="rgb(230, 230, 200)",
+            gridcolor="white",
+            showbackground=True,
+            zerolinecolor="white"
+        ),
+        aspectmode='cube'
+    ),
+    legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    height=600,
+    uirevision='constant',
+)
 
-# Filter data
-plot_df = st.session_state.tasks_df.copy()
-if not show_completed:
-    plot_df = plot_df[plot_df["Status"] == False]
+@st.cache_data(max_entries=8)
+def build_fig_3d(rows, show_dividers):
+    """Builds the 3D scatter figure with base (selection-free) colors. Cached on
+    the data alone, so selection changes never rebuild it — they only recolor
+    the cached copy via apply_selection."""
+    active, completed = rows_to_arrays(rows)
+
+    # Persistent point labels make Plotly place a DOM overlay per point on
+    # every camera move; past a small N drop them and let hover text carry
+    # the task names (hoverinfo already includes 'text')
+    n_points = active['idx'].size + completed['idx'].size
+    text_mode = 'markers+text' if n_points <= 20 else 'markers'
 
-if not plot_df.empty:
-    
-    # Helper to convert hex to rgba for transparency handling
-    def hex_to_rgba(hex_code, alpha):
-        hex_code = hex_code.lstrip('#')
-        return f"rgba({int(hex_code[0:2], 16)}, {int(hex_code[2:4], 16)}, {int(hex_code[4:6], 16)}, {alpha})"
-
-    # Define colors based on selection state (using RGBA for transparency)
-    def get_style(row, base_hex, base_alpha=1.0):
-        # If nothing is selected, return the base color/alpha
-        if not st.session_state.selected_indices:
-            return hex_to_rgba(base_hex, base_alpha)
-        # If this specific row is selected, return base color/alpha (highlighted)
-        if row.name in st.session_state.selected_indices:
-            return hex_to_rgba(base_hex, base_alpha)
-        # Otherwise (unselected), return dimmed grey
-        return "rgba(200, 200, 200, 0.1)"
-
-    # Split data
-    active_df = plot_df[plot_df["Status"] == False].copy()
-    completed_df = plot_df[plot_df["Status"] == True].copy()
-    
     # --- 3D Chart Construction ---
-    traces = []
-    
-    # Optional: Add Semi-Transparent Planes to divide quadrants (Octants)
-    if show_dividers:
-        # Plane at X=5 (Urgency midpoint)
-        traces.append(go.Surface(
-            x=[[5, 5], [5, 5]], y=[[0, 10], [0, 10]], z=[[0, 0], [10, 10]],
-            showscale=False, opacity=0.1, colorscale=[[0, 'gray'], [1, 'gray']], hoverinfo='skip'
-        ))
-        # Plane at Y=5 (Impact midpoint)
-        traces.append(go.Surface(
-            x=[[0, 10], [0, 10]], y=[[5, 5], [5, 5]], z=[[0, 0], [10, 10]],
-            showscale=False, opacity=0.1, colorscale=[[0, 'gray'], [1, 'gray']], hoverinfo='skip'
-        ))
-        # Plane at Z=5 (Effort midpoint)
-        traces.append(go.Surface(
-            x=[[0, 10], [0, 10]], y=[[0, 0], [10, 10]], z=[[5, 5], [5, 5]],
-            showscale=False, opacity=0.1, colorscale=[[0, 'gray'], [1, 'gray']], hoverinfo='skip'
-        ))
+    # Optional: the Semi-Transparent Planes dividing the quadrants (Octants)
+    traces = list(_DIVIDER_TRACES) if show_dividers else []
 
     # Active Traces
-    if not active_df.empty:
-        colors = [get_style(row, '#e74c3c', 1.0) for _, row in active_df.iterrows()]
-        
+    if active['idx'].size:
+        colors = PENDING_RGBA
+
         traces.append(go.Scatter3d(
-            x=active_df['Urgency (0-10)'],
-            y=active_df['Impact (0-10)'],
-            z=active_df['Effort (0-10)'],
-            mode='markers+text',
-            text=active_df['Task'],
+            x=active['u'],
+            y=active['i'],
+            z=active['e'],
+            mode=text_mode,
+            text=active['task'],
             textposition="top center",
             name='Pending',
-            customdata=active_df.index,
+            customdata=active['idx'],
             hoverinfo='text+x+y+z',
             marker=dict(size=8, color=colors, symbol='diamond', line=dict(width=2, color='DarkSlateGrey')),
             projection=dict(x=dict(show=True, opacity=0.3, scale=0.4), y=dict(show=True, opacity=0.3, scale=0.4), z=dict(show=True, opacity=0.3, scale=0.4))
         ))
 
     # Completed Traces
-    if not completed_df.empty:
-        colors = [get_style(row, '#2ecc71', 0.3) for _, row in completed_df.iterrows()]
-        
+    if completed['idx'].size:
+        colors = COMPLETED_RGBA
+
         traces.append(go.Scatter3d(
-            x=completed_df['Urgency (0-10)'],
-            y=completed_df['Impact (0-10)'],
-            z=completed_df['Effort (0-10)'],
-            mode='markers+text',
-            text=completed_df['Task'],
+            x=completed['u'],
+            y=completed['i'],
+            z=completed['e'],
+            mode=text_mode,
+            text=completed['task'],
             textposition="top center",
             name='Completed',
-            customdata=completed_df.index,
+            customdata=completed['idx'],
             hoverinfo='text+x+y+z',
             marker=dict(size=8, color=colors, symbol='circle', line=dict(width=2, color='DarkSlateGrey')),
             projection=dict(x=dict(show=True, opacity=0.3, scale=0.4), y=dict(show=True, opacity=0.3, scale=0.4), z=dict(show=True, opacity=0.3, scale=0.4))
         ))
 
-    fig_3d = go.Figure(data=traces)
-    
-    # Apply the requested background colors to the scene
-    fig_3d.update_layout(
-        margin=dict(l=0, r=0, b=0, t=0),
-        scene=dict(
-            xaxis=dict(
-                title='Urgency', 
-                range=[0, 10], 
-                backgroundcolor="rgb(200, 200, 230)", 
-                gridcolor="white", 
-                showbackground=True, 
-                zerolinecolor="white"
-            ),
-            yaxis=dict(
-                title='Impact', 
-                range=[0, 10], 
-                backgroundcolor="rgb(230, 200, 230)", 
-                gridcolor="white", 
-                showbackground=True, 
-                zerolinecolor="white"
-            ),
-            zaxis=dict(
-                title='Effort', 
-                # We flip the Z axis (10 to 0) so Low Effort (0) appears at the "Top".
-                # This aligns visually with High Urgency/Impact.
-                range=[10, 0], 
-                backgroundcolor="rgb(230, 230, 200)", 
-                gridcolor="white", 
-                showbackground=True, 
-                zerolinecolor="white"
-            ),
-            aspectmode='cube'
-        ),
-        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
-        height=600,
-        uirevision='constant',
-    )
+    # Static layout and dynamic traces merge in a single constructor call —
+    # no separate update_layout validation pass
+    return go.Figure(data=traces, layout=layout_3d)
+
+layout_2d = dict(
+    xaxis=dict(range=[-0.5, 10.5], constrain='domain', fixedrange=True, showgrid=False, zeroline=False),
+    yaxis=dict(range=[-0.5, 10.5], scaleanchor="x", scaleratio=1, fixedrange=True, showgrid=False, zeroline=False),
+    margin=dict(l=20, r=20, t=40, b=20),
+    showlegend=False,
+    height=350,
+    hovermode='closest',
+    shapes=[
+        dict(type="line", x0=5, y0=-0.5, x1=5, y1=10.5, line=dict(color="Gray", width=1, dash="dash")),
+        dict(type="line", x0=-0.5, y0=5, x1=10.5, y1=5, line=dict(color="Gray", width=1, dash="dash")),
+    ]
+)
+
+# Dictionary defining labels for (x, y) coordinates of quadrants
+# Format: "X vs Y": {(x_coord, y_coord): "Label"}
+# Coordinates are center points of quadrants: 2.5 (Low) and 7.5 (High)
+QUADRANT_LABELS = {
+    "Urgency vs Impact": {
+        (10, 10): "Do First",    # High Urg, High Imp
+        (0.5, 10): "Schedule",    # Low Urg, High Imp
+        (10, 0.5): "Delegate",    # High Urg, Low Imp
+        (0.5, 0.5): "Delete"       # Low Urg, Low Imp
+    },
+    "Impact vs Effort": {
+        (10, 0.5): "Quick Wins",      # High Imp, Low Eff (Visually Top Right)
+        (10, 10): "Major Projects",  # High Imp, High Eff (Visually Bottom Right)
+        (0.5, 0.5): "Fill-ins",        # Low Imp, Low Eff (Visually Top Left)
+        (0.75, 10): "Time Wasters"     # Low Imp, High Eff (Visually Bottom Left)
+    },
+    "Urgency vs Effort": {
+        (10, 0.5): "Quick Fixes",     # High Urg, Low Eff
+        (10, 10): "Critical Slog",   # High Urg, High Eff
+        (0.5, 0.5): "Maybe Later",     # Low Urg, Low Eff
+        (0.5, 10): "Avoid"            # Low Urg, High Eff
+    }
+}
 
-    with st.container(border=True, horizontal_alignment="center", gap="medium"):
-        sel_3d = st.plotly_chart(fig_3d, width="stretch", on_select="rerun", key="chart_3d")
+# Labels for the Eisenhower 2x2 Grid. Module scope, like the other chart
+# constants, so fragment reruns don't rebuild them
+EISENHOWER_LABELS = [
+    ["🔥 Do First (Urgent & Important)", "📅 Schedule (Important, Less Urgent)"],
+    ["🙋 Delegate (Urgent, Less Important)", "🗑️ Delete (Not Urgent, Not Important)"]
+]
+
+@st.cache_data(max_entries=8)
+def build_fig_2d(rows, x_key, y_key, title, x_title, y_title):
+    """Builds one 2D comparison figure with base (selection-free) colors, cached
+    on the data alone like the 3D figure."""
+    active, completed = rows_to_arrays(rows)
+
+    # Past a small N, drop the persistent point labels — the text layer is the
+    # slowest part of the re-layout — and let hover text carry the task names
+    n_points = active['idx'].size + completed['idx'].size
+    active_mode = 'markers+text' if n_points <= 50 else 'markers'
+
+    traces_2d = []
+    if active['idx'].size:
+        colors = PENDING_RGBA
+        traces_2d.append(go.Scattergl(
+            x=active[x_key], y=active[y_key], mode=active_mode,
+            text=active['task'], textposition="top center", name='Pending',
+            customdata=active['idx'],
+            marker=dict(size=10, color=colors, symbol='diamond', line=dict(width=1, color='DarkSlateGrey'))
+        ))
+    if completed['idx'].size:
+        colors = COMPLETED_2D_RGBA
+        traces_2d.append(go.Scattergl(
+            x=completed[x_key], y=completed[y_key], mode='markers',
+            text=completed['task'], name='Completed', customdata=completed['idx'],
+            marker=dict(size=8, color=colors, symbol='circle')
+        ))
 
-    # --- 2D Charts ---
+    fig_2d = go.Figure(data=traces_2d)
+    fig_2d.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, **layout_2d)
+
+    # Add Quadrant Annotations
+    if title in QUADRANT_LABELS:
+        for (qx, qy), label in QUADRANT_LABELS[title].items():
+            fig_2d.add_annotation(
+                x=qx, y=qy,
+                text=label,
+                showarrow=False,
+                font=dict(size=12, color="gray"),
+                opacity=0.5
+            )
+
+    # Invert Axis if "Effort" is involved to put 0 (Low Effort) at Top/Right
+    if "Effort" in x_title:
+         fig_2d.update_xaxes(range=[10.5, -0.5])
+    if "Effort" in y_title:
+         fig_2d.update_yaxes(range=[10.5, -0.5])
+
+    return fig_2d
+
+def apply_selection(fig, rows, selected, completed_rgba):
+    """Recolors the markers of a cached figure for the current selection.
+
+    st.cache_data hands back a fresh copy, so mutating it is safe. Restyling
+    two marker-color arrays is far cheaper than rebuilding the whole figure
+    on every selection change.
+    """
+    if not selected:
+        return fig
+
+    active, completed = rows_to_arrays(rows)
+    selected_arr = np.asarray(tuple(selected), dtype=np.int64)
+    for name, cols, base_rgba in (
+        ('Pending', active, PENDING_RGBA),
+        ('Completed', completed, completed_rgba),
+    ):
+        if cols['idx'].size:
+            sel_mask = np.isin(cols['idx'], selected_arr)
+            fig.update_traces(
+                selector=dict(name=name),
+                marker=dict(color=get_marker_colors(sel_mask, selected, base_rgba)),
+            )
+    return fig
+
+@st.fragment
+def render_analysis():
+    """All four charts plus the Eisenhower grid, isolated in a fragment so
+    selection-driven reruns only re-execute this subtree."""
     st.divider()
-    st.subheader("2D Axis Comparisons")
-    
-    col_a, col_b, col_c = st.columns(3)
-    
-    layout_2d = dict(
-        xaxis=dict(range=[-0.5, 10.5], constrain='domain', fixedrange=True, showgrid=False, zeroline=False),
-        yaxis=dict(range=[-0.5, 10.5], scaleanchor="x", scaleratio=1, fixedrange=True, showgrid=False, zeroline=False),
-        margin=dict(l=20, r=20, t=40, b=20),
-        showlegend=False,
-        height=350,
-        hovermode='closest',
-        shapes=[
-            dict(type="line", x0=5, y0=-0.5, x1=5, y1=10.5, line=dict(color="Gray", width=1, dash="dash")),
-            dict(type="line", x0=-0.5, y0=5, x1=10.5, y1=5, line=dict(color="Gray", width=1, dash="dash")),
-        ]
-    )
+    st.subheader("3D Priority Space")
 
-    # Dictionary defining labels for (x, y) coordinates of quadrants
-    # Format: "X vs Y": {(x_coord, y_coord): "Label"}
-    # Coordinates are center points of quadrants: 2.5 (Low) and 7.5 (High)
-    QUADRANT_LABELS = {
-        "Urgency vs Impact": {
-            (10, 10): "Do First",    # High Urg, High Imp
-            (0.5, 10): "Schedule",    # Low Urg, High Imp
-            (10, 0.5): "Delegate",    # High Urg, Low Imp
-            (0.5, 0.5): "Delete"       # Low Urg, Low Imp
-        },
-        "Impact vs Effort": {
-            (10, 0.5): "Quick Wins",      # High Imp, Low Eff (Visually Top Right)
-            (10, 10): "Major Projects",  # High Imp, High Eff (Visually Bottom Right)
-            (0.5, 0.5): "Fill-ins",        # Low Imp, Low Eff (Visually Top Left)
-            (0.75, 10): "Time Wasters"     # Low Imp, High Eff (Visually Bottom Left)
-        },
-        "Urgency vs Effort": {
-            (10, 0.5): "Quick Fixes",     # High Urg, Low Eff
-            (10, 10): "Critical Slog",   # High Urg, High Eff
-            (0.5, 0.5): "Maybe Later",     # Low Urg, Low Eff
-            (0.5, 10): "Avoid"            # Low Urg, High Eff
-        }
-    }
+    # Filter data. No copy needed: the charts only read from the frame, and the
+    # hidden-completed case is a fresh slice already
+    plot_df = st.session_state.tasks_df
+    if not show_completed:
+        plot_df = plot_df[plot_df["Status"] == False]
 
-    def create_2d_fig(x_col, y_col, title, x_title, y_title):
-        traces_2d = []
-        if not active_df.empty:
-            colors = [get_style(row, '#e74c3c', 1.0) for _, row in active_df.iterrows()]
-            traces_2d.append(go.Scatter(
-                x=active_df[x_col], y=active_df[y_col], mode='markers+text',
-                text=active_df['Task'], textposition="top center", name='Pending',
-                customdata=active_df.index,
-                marker=dict(size=10, color=colors, symbol='diamond', line=dict(width=1, color='DarkSlateGrey'))
-            ))
-        if not completed_df.empty:
-            colors = [get_style(row, '#2ecc71', 0.5) for _, row in completed_df.iterrows()]
-            traces_2d.append(go.Scatter(
-                x=completed_df[x_col], y=completed_df[y_col], mode='markers',
-                text=completed_df['Task'], name='Completed', customdata=completed_df.index,
-                marker=dict(size=8, color=colors, symbol='circle')
-            ))
-            
-        fig_2d = go.Figure(data=traces_2d)
-        fig_2d.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, **layout_2d)
+    if not plot_df.empty:
+
+        # Cheap hashable cache keys: a tuple of row tuples plus the selection as a frozenset
+        plot_rows = df_to_rows(plot_df)
+        selected_key = st.session_state._sel_fs
+
+        fig_3d = apply_selection(build_fig_3d(plot_rows, show_dividers), plot_rows, selected_key, COMPLETED_RGBA)
+
+        with st.container(border=True, horizontal_alignment="center", gap="medium"):
+            sel_3d = st.plotly_chart(fig_3d, width="stretch", on_select="rerun", key="chart_3d")
+
+        # --- 2D Charts ---
+        st.divider()
+        st.subheader("2D Axis Comparisons")
+
+        col_a, col_b, col_c = st.columns(3)
+
+        # Render 2D charts and capture selection
+        with col_a:
+            fig1 = apply_selection(build_fig_2d(plot_rows, 'u', 'i', "Urgency vs Impact", "Urgency", "Impact"), plot_rows, selected_key, COMPLETED_2D_RGBA)
+            sel_1 = st.plotly_chart(fig1, width="stretch", on_select="rerun", key="chart_2d_1")
+
+        with col_b:
+            fig2 = apply_selection(build_fig_2d(plot_rows, 'i', 'e', "Impact vs Effort", "Impact", "Effort"), plot_rows, selected_key, COMPLETED_2D_RGBA)
+            sel_2 = st.plotly_chart(fig2, width="stretch", on_select="rerun", key="chart_2d_2")
+
+        with col_c:
+            fig3 = apply_selection(build_fig_2d(plot_rows, 'u', 'e', "Urgency vs Effort", "Urgency", "Effort"), plot_rows, selected_key, COMPLETED_2D_RGBA)
+            sel_3 = st.plotly_chart(fig3, width="stretch", on_select="rerun", key="chart_2d_3")
+
+        # --- Selection Logic Processor ---
+        # Combine selections
+        s3d = update_selection(sel_3d, "3d")
+        s1 = update_selection(sel_1, "2d_1")
+        s2 = update_selection(sel_2, "2d_2")
+        s3 = update_selection(sel_3, "2d_3")
         
-        # Add Quadrant Annotations
-        if title in QUADRANT_LABELS:
-            for (qx, qy), label in QUADRANT_LABELS[title].items():
-                fig_2d.add_annotation(
-                    x=qx, y=qy,
-                    text=label,
-                    showarrow=False,
-                    font=dict(size=12, color="gray"),
-                    opacity=0.5
-                )
-
-        # Invert Axis if "Effort" is involved to put 0 (Low Effort) at Top/Right
-        if "Effort" in x_title:
-             fig_2d.update_xaxes(range=[10.5, -0.5])
-        if "Effort" in y_title:
-             fig_2d.update_yaxes(range=[10.5, -0.5])
-             
-        return fig_2d
-
-    # Render 2D charts and capture selection
-    with col_a:
-        fig1 = create_2d_fig('Urgency (0-10)', 'Impact (0-10)', "Urgency vs Impact", "Urgency", "Impact")
-        sel_1 = st.plotly_chart(fig1, width="stretch", on_select="rerun", key="chart_2d_1")
-
-    with col_b:
-        fig2 = create_2d_fig('Impact (0-10)', 'Effort (0-10)', "Impact vs Effort", "Impact", "Effort")
-        sel_2 = st.plotly_chart(fig2, width="stretch", on_select="rerun", key="chart_2d_2")
-
-    with col_c:
-        fig3 = create_2d_fig('Urgency (0-10)', 'Effort (0-10)', "Urgency vs Effort", "Urgency", "Effort")
-        sel_3 = st.plotly_chart(fig3, width="stretch", on_select="rerun", key="chart_2d_3")
-
-    # --- Selection Logic Processor ---
-    # Combine selections
-    s3d = update_selection(sel_3d, "3d")
-    s1 = update_selection(sel_1, "2d_1")
-    s2 = update_selection(sel_2, "2d_2")
-    s3 = update_selection(sel_3, "2d_3")
-    
-    candidates = [s for s in [s3d, s1, s2, s3] if s is not None]
-    
-    if candidates:
-        flat_list = list(set([item for sublist in candidates for item in sublist])) if isinstance(candidates[0], list) else candidates[0]
-        if set(flat_list) != set(st.session_state.selected_indices):
-            st.session_state.selected_indices = flat_list
-            st.rerun()
-    
-    # --- Eisenhower Matrix View (Urgency vs Impact) ---
-    st.divider()
-    st.subheader("Action Matrix (Eisenhower Method)")
-    st.caption("Tasks are grouped by Urgency & Impact, then sorted by Effort (Easiest first).")
-
-    # Define bins for Eisenhower (2x2)
-    # Urgency (High/Low) vs Impact (High/Low)
-    # Cutoff at 5
-    def categorize_eisenhower(row):
-        # Urgency: High (>5) vs Low (<=5)
-        # Impact: High (>5) vs Low (<=5)
+        candidates = [s for s in [s3d, s1, s2, s3] if s is not None]
         
-        urgent = row["Urgency (0-10)"] >= 5
-        important = row["Impact (0-10)"] >= 5
+        if candidates:
+            # update_selection always returns a list, so one C-level union
+            # replaces the flatten-then-set two-pass merge
+            new_fs = frozenset().union(*candidates)
+            # Only rerun when the selection actually changed; clicking an already
+            # selected point should not pay for a full script re-execution
+            if new_fs != st.session_state._sel_fs:
+                st.session_state.selected_indices = list(new_fs)
+                st.session_state._sel_fs = new_fs
+                # Everything selection-dependent lives in this fragment, so a
+                # fragment-scoped rerun is enough
+                st.rerun(scope="fragment")
         
-        if urgent and important:
-            return 0, 0 # Do First (Top Left)
-        elif not urgent and important:
-            return 0, 1 # Schedule (Top Right)
-        elif urgent and not important:
-            return 1, 0 # Delegate (Bottom Left)
-        else:
-            return 1, 1 # Don't Do (Bottom Right)
-
-    # Labels for the 2x2 Grid
-    eisenhower_labels = [
-        ["🔥 Do First (Urgent & Important)", "📅 Schedule (Important, Less Urgent)"],
-        ["🙋 Delegate (Urgent, Less Important)", "🗑️ Delete (Not Urgent, Not Important)"]
-    ]
-    
-    # Initialize grid buckets
-    # grid_tasks[row][col] -> list of row data
-    grid_tasks = [[[], []], [[], []]]
-    
-    # Populate buckets using plot_df
-    for _, row in plot_df.iterrows():
-        r, c = categorize_eisenhower(row)
-        grid_tasks[r][c].append(row)
-
-    # Render the grid (2x2)
-    e_cols = st.columns(2)
-    
-    for r_idx in range(2):
-        for c_idx in range(2):
-            with e_cols[c_idx]: # 0 is Left, 1 is Right
-                with st.container(border=True):
-                    st.markdown(f"### {eisenhower_labels[r_idx][c_idx]}")
-                    
-                    tasks_in_bucket = grid_tasks[r_idx][c_idx]
-                    
-                    if tasks_in_bucket:
-                        # Sort by Effort (Low effort first = Quickest wins in that quadrant)
-                        sorted_tasks = sorted(tasks_in_bucket, key=lambda x: x["Effort (0-10)"])
-                        
-                        for t in sorted_tasks:
-                            effort_val = t["Effort (0-10)"]
-                            # Visual cue for effort
-                            eff_icon = "🟢" if effort_val < 4 else ("🟡" if effort_val < 8 else "🔴")
-                            st.markdown(f"- **{t['Task']}**")
-                            st.caption(f"Effort: {effort_val}/10 {eff_icon}")
-                    else:
-                        st.caption("No tasks")
+        # --- Eisenhower Matrix View (Urgency vs Impact) ---
+        st.divider()
+        st.subheader("Action Matrix (Eisenhower Method)")
+        st.caption("Tasks are grouped by Urgency & Impact, then sorted by Effort (Easiest first).")
+
+        # Define bins for Eisenhower (2x2)
+        # Urgency (High/Low) vs Impact (High/Low)
+        # Cutoff at 5, vectorized: row = not important, col = not urgent,
+        # so bucket 0..3 maps straight onto the grid via divmod(bucket, 2)
+        urgent = plot_df["Urgency (0-10)"].to_numpy() >= 5
+        important = plot_df["Impact (0-10)"].to_numpy() >= 5
+        bucket = (~important).astype(np.int8) * 2 + (~urgent).astype(np.int8)
+
+        # Initialize grid buckets
+        # grid_tasks[row][col] -> list of (task, effort), pre-sorted by effort
+        grid_tasks = [[[], []], [[], []]]
+
+        # Populate buckets using plot_df, one group per quadrant
+        for b, group in plot_df.assign(_bucket=bucket).groupby("_bucket", sort=False):
+            r, c = divmod(int(b), 2)
+            grid_tasks[r][c] = list(
+                group.sort_values("Effort (0-10)")[["Task", "Effort (0-10)"]]
+                .itertuples(index=False, name=None)
+            )
+
+        # Render the grid (2x2)
+        e_cols = st.columns(2)
         
-        # Add visual separator between Important (Row 0) and Not Important (Row 1)
-        if r_idx == 0:
-            st.divider()
+        for r_idx in range(2):
+            for c_idx in range(2):
+                with e_cols[c_idx]: # 0 is Left, 1 is Right
+                    with st.container(border=True):
+                        st.markdown(f"### {EISENHOWER_LABELS[r_idx][c_idx]}")
+                        
+                        tasks_in_bucket = grid_tasks[r_idx][c_idx]
+                        
+                        if tasks_in_bucket:
+                            # Buckets are already sorted by Effort (Low effort first = Quickest wins).
+                            # Each quadrant renders as a single markdown blob — one Streamlit
+                            # element instead of two per task
+                            lines = []
+                            for task_name, effort_val in tasks_in_bucket:
+                                # Visual cue for effort
+                                eff_icon = "🟢" if effort_val < 4 else ("🟡" if effort_val < 8 else "🔴")
+                                lines.append(
+                                    f"- **{task_name}**  \n"
+                                    f"  <span style='font-size:0.85em;color:gray'>Effort: {effort_val}/10 {eff_icon}</span>"
+                                )
+                            st.markdown("\n".join(lines), unsafe_allow_html=True)
+                        else:
+                            st.caption("No tasks")
+            
+            # Add visual separator between Important (Row 0) and Not Important (Row 1)
+            if r_idx == 0:
+                st.divider()
+
+    else:
+        st.info("No tasks to display. Add some tasks in the table on the left!")
 
-else:
-    st.info("No tasks to display. Add some tasks in the table on the left!")
+render_analysis()
 
 # --- Metrics Summary ---
 st.divider()